@@ -1,6 +1,7 @@
 #include <iostream>
 #include <fstream>
 #include <unordered_map>
+#include <unordered_set>
 #include <vector>
 #include <sstream>
 #include <string>
@@ -11,12 +12,74 @@
 #include <filesystem>
 #include <chrono> 
 #include <iomanip> 
+#include <cstdint>
+#include <csignal>
 
 using namespace std;
 namespace fs = filesystem;
 
 unordered_map<int, vector<pair<int, int>>> graph;
 
+// set when graph.csv was exported with --order: nodes are labels 0..n-1 in locality order
+// (scripts/ordering.py), stored by label, and page_of maps them back to page ids
+vector<vector<pair<int, int>>> dense_graph;
+bool dense_loaded = false;
+size_t dense_skipped = 0;
+vector<int> page_of;
+unordered_map<int, int> label_of;
+
+// .wgc base graph (written by scripts/wgc.py); neighbor lists stay encoded and are decoded during search
+struct CompressedGraph {
+    bool loaded = false;
+    size_t file_bytes = 0;
+    uint64_t edge_count = 0;
+    vector<int> nodes;
+    vector<uint64_t> offsets;
+    vector<uint8_t> adjacency;
+};
+
+CompressedGraph compressed;
+
+// edits from a delta file, layered over the base graph so graph.csv never has to be re-exported
+struct DeltaOverlay {
+    unordered_map<int, vector<pair<int, int>>> added;
+    unordered_set<long long> removed;
+    unordered_map<long long, int> reweighted;
+    unordered_set<int> nodes;
+    int ops = 0;
+};
+
+DeltaOverlay overlay;
+
+// per-query time budget and cancellation; SIGTERM/SIGINT set the token so the caller can abandon a query
+struct QueryBudget {
+    chrono::steady_clock::time_point deadline = chrono::steady_clock::time_point::max();
+    bool exceeded = false;
+    string reason;
+    unsigned checks = 0;
+};
+
+QueryBudget budget;
+volatile sig_atomic_t cancel_requested = 0;
+
+void requestCancel(int) {
+    cancel_requested = 1;
+}
+
+// called once per settled node: the token is a plain flag read, the clock is only read every 1024 calls
+bool budgetExceeded() {
+    if (budget.exceeded) return true;
+    if (cancel_requested) {
+        budget.reason = "cancelled";
+    } else if ((budget.checks++ & 1023) == 0 && chrono::steady_clock::now() >= budget.deadline) {
+        budget.reason = "deadline";
+    } else {
+        return false;
+    }
+    budget.exceeded = true;
+    return true;
+}
+
 struct PerformanceMetrics {
     string timestamp;
     string algorithm;
@@ -50,44 +113,338 @@ void writeMetricsToCSV(const PerformanceMetrics& metrics) {
 void loadGraph(const string& filename) {
     ifstream file(filename);
     string line;
+    dense_loaded = !page_of.empty();
+    if (dense_loaded) dense_graph.resize(page_of.size());
     while (getline(file, line)) {
         stringstream ss(line);
         int from, to, weight;
         char comma;
         ss >> from >> comma >> to >> comma >> weight;
-        graph[from].emplace_back(to, weight);
+        if (dense_loaded) {
+            if (from < 0 || from >= static_cast<int>(dense_graph.size())) {
+                dense_skipped++;
+                continue;
+            }
+            dense_graph[from].emplace_back(to, weight);
+        } else {
+            graph[from].emplace_back(to, weight);
+        }
+    }
+}
+
+// graph_order.tsv lines are "<label>\t<page_id>", one per label in ascending order
+bool loadOrder(const string& filename) {
+    ifstream file(filename);
+    string line;
+    while (getline(file, line)) {
+        stringstream ss(line);
+        int label, page_id;
+        if (!(ss >> label >> page_id)) continue;
+        label_of[page_id] = page_of.size();
+        page_of.push_back(page_id);
+    }
+    return !page_of.empty();
+}
+
+int toLabel(int page_id) {
+    if (page_of.empty()) return page_id;
+    auto it = label_of.find(page_id);
+    if (it != label_of.end()) return it->second;
+    // pages the export never saw (e.g. added by a delta) get fresh labels past the base graph
+    label_of[page_id] = page_of.size();
+    page_of.push_back(page_id);
+    return page_of.size() - 1;
+}
+
+// a graph keyed by page ids (or by another permutation) has ids past the last label
+bool graphMatchesOrder() {
+    if (page_of.empty()) return true;
+    if (compressed.loaded) {
+        return compressed.nodes.empty() || compressed.nodes.back() < static_cast<int>(page_of.size());
+    }
+    return dense_skipped == 0;
+}
+
+int toPageId(int label) {
+    return page_of.empty() ? label : page_of[label];
+}
+
+bool loadCompressedGraph(const string& filename) {
+    ifstream file(filename, ios::binary);
+    char magic[4];
+    uint32_t node_count = 0;
+    if (!file.read(magic, 4) || string(magic, 4) != "WGC1") return false;
+    file.read(reinterpret_cast<char*>(&node_count), sizeof(node_count));
+    file.read(reinterpret_cast<char*>(&compressed.edge_count), sizeof(compressed.edge_count));
+
+    compressed.nodes.resize(node_count);
+    compressed.offsets.resize(node_count + 1);
+    file.read(reinterpret_cast<char*>(compressed.nodes.data()), node_count * sizeof(int));
+    file.read(reinterpret_cast<char*>(compressed.offsets.data()), (node_count + 1) * sizeof(uint64_t));
+    compressed.adjacency.resize(compressed.offsets.back());
+    file.read(reinterpret_cast<char*>(compressed.adjacency.data()), compressed.adjacency.size());
+    if (!file) return false;
+
+    compressed.file_bytes = 16 + node_count * sizeof(int) + (node_count + 1) * sizeof(uint64_t) + compressed.adjacency.size();
+    compressed.loaded = true;
+    return true;
+}
+
+int compressedIndex(int node) {
+    auto it = lower_bound(compressed.nodes.begin(), compressed.nodes.end(), node);
+    if (it == compressed.nodes.end() || *it != node) return -1;
+    return it - compressed.nodes.begin();
+}
+
+// each entry is a varint of (gap << 1) | (weight - 1); the first gap is zigzagged relative to the node itself
+template <typename F>
+void decodeNeighbors(int index, F&& f) {
+    const uint8_t* p = compressed.adjacency.data() + compressed.offsets[index];
+    const uint8_t* end = compressed.adjacency.data() + compressed.offsets[index + 1];
+    long long prev = compressed.nodes[index];
+    bool first = true;
+    while (p < end) {
+        uint64_t value = 0;
+        int shift = 0;
+        while (*p & 0x80) {
+            value |= static_cast<uint64_t>(*p++ & 0x7F) << shift;
+            shift += 7;
+        }
+        value |= static_cast<uint64_t>(*p++) << shift;
+
+        uint64_t gap = value >> 1;
+        if (first) {
+            prev += (gap & 1) ? -static_cast<long long>((gap + 1) >> 1) : static_cast<long long>(gap >> 1);
+            first = false;
+        } else {
+            prev += gap + 1;
+        }
+        f(static_cast<int>(prev), static_cast<int>(value & 1) + 1);
+    }
+}
+
+template <typename F>
+void forEachBaseNeighbor(int u, F&& f) {
+    if (compressed.loaded) {
+        int index = compressedIndex(u);
+        if (index >= 0) decodeNeighbors(index, f);
+        return;
+    }
+    if (dense_loaded) {
+        if (u < 0 || u >= static_cast<int>(dense_graph.size())) return;
+        for (auto [v, w] : dense_graph[u]) f(v, w);
+        return;
+    }
+    auto it = graph.find(u);
+    if (it == graph.end()) return;
+    for (auto [v, w] : it->second) f(v, w);
+}
+
+bool baseHasNode(int node) {
+    if (compressed.loaded) return compressedIndex(node) >= 0;
+    if (dense_loaded) return node >= 0 && node < static_cast<int>(dense_graph.size());
+    return graph.count(node) > 0;
+}
+
+size_t baseEdgeCount() {
+    if (compressed.loaded) return compressed.edge_count;
+    size_t count = 0;
+    for (const auto& edges : dense_graph) count += edges.size();
+    for (const auto& [node, edges] : graph) count += edges.size();
+    return count;
+}
+
+long long edgeKey(int from, int to) {
+    return (static_cast<long long>(from) << 32) | static_cast<unsigned int>(to);
+}
+
+int baseWeight(int from, int to) {
+    int weight = 0;
+    forEachBaseNeighbor(from, [&](int v, int w) {
+        if (v == to) weight = w;
+    });
+    return weight;
+}
+
+bool hasEdge(int from, int to) {
+    auto it = overlay.added.find(from);
+    if (it != overlay.added.end()) {
+        for (auto [v, _] : it->second) {
+            if (v == to) return true;
+        }
+    }
+    return baseWeight(from, to) && !overlay.removed.count(edgeKey(from, to));
+}
+
+void setWeight(int from, int to, int weight) {
+    auto it = overlay.added.find(from);
+    if (it != overlay.added.end()) {
+        for (auto& [v, w] : it->second) {
+            if (v == to) {
+                w = weight;
+                return;
+            }
+        }
+    }
+    if (baseWeight(from, to) == weight) overlay.reweighted.erase(edgeKey(from, to));
+    else overlay.reweighted[edgeKey(from, to)] = weight;
+}
+
+// same rule as 4_export_graph.py: a link weighs 2 if the reverse link exists, otherwise 1
+void recomputeWeights(int a, int b) {
+    bool forward = hasEdge(a, b);
+    bool backward = hasEdge(b, a);
+    int weight = (forward && backward) ? 2 : 1;
+    if (forward) setWeight(a, b, weight);
+    if (backward) setWeight(b, a, weight);
+}
+
+void addEdge(int from, int to) {
+    if (hasEdge(from, to)) return;
+    // re-adding a removed base edge just lifts the removal
+    if (!overlay.removed.erase(edgeKey(from, to))) {
+        overlay.added[from].emplace_back(to, 1);
+    }
+    overlay.nodes.insert(from);
+    overlay.nodes.insert(to);
+    recomputeWeights(from, to);
+}
+
+void removeEdge(int from, int to) {
+    if (!hasEdge(from, to)) return;
+    bool was_added = false;
+    auto it = overlay.added.find(from);
+    if (it != overlay.added.end()) {
+        auto& edges = it->second;
+        for (size_t i = 0; i < edges.size(); ++i) {
+            if (edges[i].first == to) {
+                edges.erase(edges.begin() + i);
+                was_added = true;
+                break;
+            }
+        }
+    }
+    if (!was_added) {
+        overlay.removed.insert(edgeKey(from, to));
+        overlay.reweighted.erase(edgeKey(from, to));
+    }
+    recomputeWeights(from, to);
+}
+
+// delta lines are "add,<from>,<to>", "remove,<from>,<to>" or "node,<id>,<title>", applied in file order.
+// node lines only carry a title for the app: like graph.csv, the graph holds a page once it has links,
+// so an edge-less page is not a node here either and compaction doesn't change what queries see
+void loadDelta(const string& filename) {
+    ifstream file(filename);
+    string line;
+    while (getline(file, line)) {
+        stringstream ss(line);
+        string op, first, second;
+        getline(ss, op, ',');
+        getline(ss, first, ',');
+        getline(ss, second, ',');
+        try {
+            if (op == "add") {
+                addEdge(toLabel(stoi(first)), toLabel(stoi(second)));
+            } else if (op == "remove") {
+                removeEdge(toLabel(stoi(first)), toLabel(stoi(second)));
+            } else if (op != "node") {
+                continue;
+            }
+        } catch (const exception&) {
+            continue;
+        }
+        overlay.ops++;
+    }
+}
+
+template <typename F>
+void forEachNode(F&& f) {
+    if (compressed.loaded) {
+        for (int node : compressed.nodes) f(node);
+    } else if (dense_loaded) {
+        for (int node = 0; node < static_cast<int>(dense_graph.size()); ++node) f(node);
+    } else {
+        for (const auto& [node, _] : graph) f(node);
+    }
+    for (int node : overlay.nodes) {
+        if (!baseHasNode(node)) f(node);
+    }
+}
+
+template <typename F>
+void forEachNeighbor(int u, F&& f) {
+    bool patched = !overlay.removed.empty() || !overlay.reweighted.empty();
+    forEachBaseNeighbor(u, [&](int v, int w) {
+        if (patched) {
+            long long key = edgeKey(u, v);
+            if (overlay.removed.count(key)) return;
+            auto rw = overlay.reweighted.find(key);
+            if (rw != overlay.reweighted.end()) w = rw->second;
+        }
+        f(v, w);
+    });
+    auto added = overlay.added.find(u);
+    if (added != overlay.added.end()) {
+        for (auto [v, w] : added->second) f(v, w);
     }
 }
 
+bool hasNode(int node) {
+    return baseHasNode(node) || overlay.nodes.count(node);
+}
+
+size_t nodeCount() {
+    size_t count = 0;
+    forEachNode([&](int) { count++; });
+    return count;
+}
+
+size_t edgeCount() {
+    size_t count = baseEdgeCount();
+    for (const auto& [node, edges] : overlay.added) count += edges.size();
+    return count - overlay.removed.size();
+}
+
 void printGraphStats() {
-    cout << "Graph loaded with " << graph.size() << " nodes." << endl;
-    size_t edge_count = 0;
-    for (const auto& [node, edges] : graph) {
-        edge_count += edges.size();
+    cout << "Graph loaded with " << nodeCount() << " nodes." << endl;
+    cout << "Total edges: " << edgeCount() << endl;
+    if (compressed.loaded && compressed.edge_count) {
+        cout << fixed << setprecision(2)
+             << "Compressed graph: " << static_cast<double>(compressed.adjacency.size()) / compressed.edge_count
+             << " bytes/edge adjacency, " << static_cast<double>(compressed.file_bytes) / compressed.edge_count
+             << " bytes/edge total." << endl;
+        cout.unsetf(ios::floatfield);
+        cout << setprecision(6);
+    }
+    if (overlay.ops) {
+        cout << "Applied " << overlay.ops << " delta operations." << endl;
     }
-    cout << "Total edges: " << edge_count << endl;
 }
 
 vector<int> dijkstra(int source, int target, int& nodes_visited) {
     nodes_visited = 0;
     unordered_map<int, int> dist, prev;
-    for (const auto& [node, _] : graph) dist[node] = numeric_limits<int>::max();
+    forEachNode([&](int node) { dist[node] = numeric_limits<int>::max(); });
+    // a target with no links of its own isn't a node, but must still read as unreached rather than 0
+    dist.emplace(target, numeric_limits<int>::max());
     dist[source] = 0;
     priority_queue<pair<int, int>, vector<pair<int, int>>, greater<>> pq;
     pq.emplace(0, source);
 
     while (!pq.empty()) {
+        if (budgetExceeded()) return {};
         auto [cost, u] = pq.top(); pq.pop();
         nodes_visited++;
         if (u == target) break;
         if (cost > dist[u]) continue;
-        for (auto [v, w] : graph[u]) {
+        forEachNeighbor(u, [&](int v, int w) {
             if (dist[u] + w < dist[v]) {
                 dist[v] = dist[u] + w;
                 prev[v] = u;
                 pq.emplace(dist[v], v);
             }
-        }
+        });
     }
 
     vector<int> path;
@@ -101,27 +458,34 @@ vector<int> dijkstra(int source, int target, int& nodes_visited) {
 vector<int> dial(int source, int target, int& nodes_visited, int max_weight = 50) {
     nodes_visited = 0;
     unordered_map<int, int> dist, prev;
-    for (const auto& [node, _] : graph) dist[node] = numeric_limits<int>::max();
+    forEachNode([&](int node) { dist[node] = numeric_limits<int>::max(); });
+    dist.emplace(target, numeric_limits<int>::max());
     dist[source] = 0;
-    vector<deque<int>> buckets(max_weight * graph.size());
+    // weights never exceed max_weight, so pending distances span at most max_weight + 1 buckets;
+    // a ring that size replaces one bucket per possible distance, which took seconds just to allocate
+    vector<deque<int>> buckets(max_weight + 1);
     buckets[0].push_back(source);
+    size_t pending = 1;
     int idx = 0;
 
-    while (true) {
-        while (idx < buckets.size() && buckets[idx].empty()) ++idx;
-        if (idx == buckets.size()) break;
+    while (pending > 0) {
+        while (buckets[idx % buckets.size()].empty()) ++idx;
 
-        int u = buckets[idx].front();
-        buckets[idx].pop_front();
+        if (budgetExceeded()) return {};
+        auto& bucket = buckets[idx % buckets.size()];
+        int u = bucket.front();
+        bucket.pop_front();
+        pending--;
         nodes_visited++;
 
-        for (auto [v, w] : graph[u]) {
+        forEachNeighbor(u, [&](int v, int w) {
             if (dist[u] + w < dist[v]) {
                 dist[v] = dist[u] + w;
                 prev[v] = u;
-                buckets[dist[v]].push_back(v);
+                buckets[dist[v] % buckets.size()].push_back(v);
+                pending++;
             }
-        }
+        });
     }
 
     vector<int> path;
@@ -133,37 +497,72 @@ vector<int> dial(int source, int target, int& nodes_visited, int max_weight = 50
 }
 
 int main(int argc, char* argv[]) {
-    if (argc != 5) {
-        cerr << "Usage: " << argv[0] << " <graph.csv> <dijkstra|dial> <source_id> <target_id>\n";
+    if (argc < 5 || argc % 2 == 0) {
+        cerr << "Usage: " << argv[0] << " <graph.csv|graph.wgc> <dijkstra|dial> <source_id> <target_id>"
+             << " [--delta <delta.csv>] [--order <graph_order.tsv>] [--deadline-ms <ms>]\n";
         return 1;
     }
 
     auto total_start = chrono::high_resolution_clock::now();
+    auto budget_start = chrono::steady_clock::now();
+    signal(SIGTERM, requestCancel);
+    signal(SIGINT, requestCancel);
     string graph_file = argv[1];
     string algo = argv[2];
     int source = stoi(argv[3]);
     int target = stoi(argv[4]);
+    string delta_file, order_file;
+    for (int i = 5; i + 1 < argc; i += 2) {
+        string option = argv[i];
+        if (option == "--delta") {
+            delta_file = argv[i + 1];
+        } else if (option == "--order") {
+            order_file = argv[i + 1];
+        } else if (option == "--deadline-ms") {
+            budget.deadline = budget_start + chrono::milliseconds(stoi(argv[i + 1]));
+        } else {
+            cerr << "Unknown option: " << option << endl;
+            return 1;
+        }
+    }
 
     auto load_start = chrono::high_resolution_clock::now();
-    loadGraph(graph_file);
+    if (!order_file.empty() && !loadOrder(order_file)) {
+        cerr << "Failed to read node order: " << order_file << endl;
+        return 1;
+    }
+    if (graph_file.size() >= 4 && graph_file.compare(graph_file.size() - 4, 4, ".wgc") == 0) {
+        if (!loadCompressedGraph(graph_file)) {
+            cerr << "Failed to read compressed graph: " << graph_file << endl;
+            return 1;
+        }
+    } else {
+        loadGraph(graph_file);
+    }
+    if (!graphMatchesOrder()) {
+        cerr << "Graph " << graph_file << " was not exported with node order " << order_file << endl;
+        return 1;
+    }
+    if (!delta_file.empty()) loadDelta(delta_file);
     auto load_end = chrono::high_resolution_clock::now();
     double load_time = chrono::duration<double, milli>(load_end - load_start).count();
     
     printGraphStats();
     
-    int graph_nodes = graph.size();
-    int graph_edges = 0;
-    for (const auto& [node, edges] : graph) {
-        graph_edges += edges.size();
-    }
+    int graph_nodes = nodeCount();
+    int graph_edges = edgeCount();
+    int source_node = toLabel(source);
+    int target_node = toLabel(target);
 
-    if (graph.count(source)) {
-        cout << "Source node " << source << " has " << graph[source].size() << " neighbors:\n";
+    if (hasNode(source_node)) {
+        int degree = 0;
+        forEachNeighbor(source_node, [&](int, int) { degree++; });
+        cout << "Source node " << source << " has " << degree << " neighbors:\n";
     } else {
         cout << "Source node " << source << " not found in graph.\n";
     }
 
-    if (graph.count(target)) {
+    if (hasNode(target_node)) {
         cout << "Target node " << target << " is in graph.\n";
     } else {
         cout << "Target node " << target << " not found in graph.\n";
@@ -173,17 +572,22 @@ int main(int argc, char* argv[]) {
     int nodes_visited = 0;
     auto algo_start = chrono::high_resolution_clock::now();
     
-    if (algo == "dijkstra") {
-        path = dijkstra(source, target, nodes_visited);
-    } else if (algo == "dial") {
-        path = dial(source, target, nodes_visited);
-    } else {
+    if (algo != "dijkstra" && algo != "dial") {
         cerr << "Unknown algorithm: " << algo << endl;
         return 1;
     }
+    // the deadline covers loading too, so a query that is already over budget never starts searching
+    if (!budgetExceeded()) {
+        if (algo == "dijkstra") {
+            path = dijkstra(source_node, target_node, nodes_visited);
+        } else {
+            path = dial(source_node, target_node, nodes_visited);
+        }
+    }
     
     auto algo_end = chrono::high_resolution_clock::now();
     double algorithm_time = chrono::duration<double, milli>(algo_end - algo_start).count();
+    for (int& node : path) node = toPageId(node);
 
     auto now = chrono::system_clock::now();
     auto in_time_t = chrono::system_clock::to_time_t(now);
@@ -198,7 +602,7 @@ int main(int argc, char* argv[]) {
     metrics.load_time = load_time;
     metrics.algorithm_time = algorithm_time;
     metrics.nodes_visited = nodes_visited;
-    metrics.path_length = path.empty() ? -1 : (path.size() - 1);
+    metrics.path_length = budget.exceeded ? -2 : path.empty() ? -1 : (path.size() - 1);
     metrics.graph_nodes = graph_nodes;
     metrics.graph_edges = graph_edges;
 
@@ -211,7 +615,14 @@ int main(int argc, char* argv[]) {
         return 1;
     }
 
-    if (path.empty()) {
+    if (budget.exceeded) {
+        double elapsed = chrono::duration<double, milli>(chrono::steady_clock::now() - budget_start).count();
+        stringstream msg;
+        msg << "Search exceeded budget (" << budget.reason << ") after " << elapsed << " ms with "
+            << nodes_visited << " nodes visited from " << source << " to " << target << ".\n";
+        cout << msg.str();
+        out << msg.str();
+    } else if (path.empty()) {
         string msg = "No path found from " + to_string(source) + " to " + to_string(target) + ".\n";
         cout << msg;
         out << msg;
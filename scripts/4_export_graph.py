@@ -1,7 +1,19 @@
 from tqdm import tqdm #(THIS MODULE IS FOR PROGRESS BARS DO NOT REMOVE.)
 import os
+import sys
+from collections import defaultdict
+from wgc import write_compressed_graph
+from ordering import ORDERINGS
 
 #script to convert the top 100k links found in earlier steps into a usable graph.csv file for c++ code
+#pass --compressed to also write data/graph.wgc, the gap-encoded adjacency format (see wgc.py)
+#pass --order=bfs|rcm|degree to relabel nodes 0..n-1 for memory locality (see ordering.py); the
+#label -> page id permutation is written to data/graph_order.tsv for the pathfinder's --order option
+
+write_compressed = "--compressed" in sys.argv
+order_name = next((arg.split("=", 1)[1] for arg in sys.argv if arg.startswith("--order=")), None)
+if order_name is not None and order_name not in ORDERINGS:
+    raise SystemExit(f"Unknown ordering '{order_name}', expected one of: {', '.join(ORDERINGS)}")
 
 top_ids = set()
 with open("data/top100k.txt", encoding="utf-8") as f:
@@ -44,9 +56,43 @@ if examples:
     for example in sorted(examples):
         print(f"  → '{example}'")
 
-with open("data/graph.csv", "w", encoding="utf-8") as f_out:
+#the app serves graph.wgc whenever it exists, so an old one would hide the graph.csv written below
+if not write_compressed and os.path.exists("data/graph.wgc"):
+    os.remove("data/graph.wgc")
+
+if order_name:
+    neighbors = defaultdict(set)
     for a, b in edges:
-        weight = 1 if (b, a) not in edges else 2
+        neighbors[a].add(b)
+        neighbors[b].add(a)
+    order = ORDERINGS[order_name](neighbors)
+    labels = {page_id: label for label, page_id in enumerate(order)}
+
+    with open("data/graph_order.tsv", "w", encoding="utf-8") as f_out:
+        for label, page_id in enumerate(order):
+            f_out.write(f"{label}\t{page_id}\n")
+    print(f"Relabeled {len(order):,} nodes in {order_name} order.")
+
+    #rows grouped by source label so the file (and the pathfinder's arrays) follow the new order
+    rows = sorted((labels[a], labels[b], 1 if (b, a) not in edges else 2) for a, b in edges)
+else:
+    #a stale permutation would map page ids to the wrong nodes
+    if os.path.exists("data/graph_order.tsv"):
+        os.remove("data/graph_order.tsv")
+    rows = [(a, b, 1 if (b, a) not in edges else 2) for a, b in edges]
+
+with open("data/graph.csv", "w", encoding="utf-8") as f_out:
+    for a, b, weight in rows:
         f_out.write(f"{a},{b},{weight}\n")
 
 print(f"Finished exporting graph.csv with {len(edges):,} edges.")
+
+if write_compressed:
+    adjacency = defaultdict(list)
+    for a, b, weight in rows:
+        adjacency[int(a)].append((int(b), weight))
+
+    csv_size = os.path.getsize("data/graph.csv")
+    wgc_size = write_compressed_graph("data/graph.wgc", adjacency)
+    print(f"graph.csv: {csv_size:,} bytes ({csv_size / max(len(edges), 1):.2f} bytes/edge)")
+    print(f"graph.wgc: {wgc_size:,} bytes ({wgc_size / max(len(edges), 1):.2f} bytes/edge)")
@@ -0,0 +1,120 @@
+from tqdm import tqdm #(THIS MODULE IS FOR PROGRESS BARS DO NOT REMOVE.)
+import os
+from collections import defaultdict
+from wgc import write_compressed_graph
+
+#script to fold the link delta (graph_delta.csv) into a new graph.csv base so the overlay stays small.
+#run it periodically (e.g. from cron); the pathfinder applies the delta on every query until then.
+#pause whatever appends to graph_delta.csv while this runs: an append that lands after the final trim
+#reads the file goes to the replaced file and is lost.
+#delta lines: "add,<from>,<to>", "remove,<from>,<to>" or "node,<id>,<title>", applied in file order.
+#delta ids are page ids; if the graph was exported with --order they are mapped to labels via graph_order.tsv.
+
+graph_path = "data/graph.csv"
+compressed_path = "data/graph.wgc"
+delta_path = "data/graph_delta.csv"
+titles_path = "data/top100k_id_title.tsv"
+order_path = "data/graph_order.tsv"
+
+if not os.path.exists(delta_path) or os.path.getsize(delta_path) == 0:
+    print("No delta to compact.")
+    raise SystemExit(0)
+
+edges = set()
+with open(graph_path, "r", encoding="utf-8") as f:
+    for line in tqdm(f, desc="Loading graph.csv"):
+        parts = line.strip().split(",")
+        if len(parts) != 3:
+            continue
+        edges.add((parts[0], parts[1]))
+
+print(f"Loaded {len(edges):,} base edges.")
+
+labels = None
+if os.path.exists(order_path):
+    labels = {}
+    with open(order_path, "r", encoding="utf-8") as f:
+        for line in f:
+            label, page_id = line.strip().split("\t", 1)
+            labels[page_id] = label
+    base_label_count = len(labels)
+
+def node_label(page_id):
+    #pages new to the graph get the next free label, after every existing node
+    if labels is None:
+        return page_id
+    if page_id not in labels:
+        labels[page_id] = str(len(labels))
+    return labels[page_id]
+
+#snapshot the delta now; only these lines are folded in and trimmed at the end
+with open(delta_path, "r", encoding="utf-8") as f:
+    delta_lines = f.readlines()
+
+added = 0
+removed = 0
+new_titles = {}
+for line in delta_lines:
+    parts = line.rstrip("\n").split(",", 2)
+    if len(parts) != 3:
+        continue
+    op, first, second = parts
+    if op == "node":
+        new_titles[first] = second
+        continue
+    edge = (node_label(first), node_label(second))
+    if op == "add" and edge not in edges:
+        edges.add(edge)
+        added += 1
+    elif op == "remove" and edge in edges:
+        edges.remove(edge)
+        removed += 1
+
+print(f"Applied {len(delta_lines):,} delta lines: +{added:,} / -{removed:,} edges, {len(new_titles):,} new nodes.")
+
+#new labels go in before the graph that uses them; extra labels are harmless to the old graph
+if labels is not None and len(labels) > base_label_count:
+    with open(order_path, "a", encoding="utf-8") as f_out:
+        for page_id, label in sorted(labels.items(), key=lambda item: int(item[1]))[base_label_count:]:
+            f_out.write(f"{label}\t{page_id}\n")
+
+#keep the relabeled file grouped by source label, as the export wrote it
+if labels is not None:
+    edges_out = sorted(edges, key=lambda edge: (int(edge[0]), int(edge[1])))
+else:
+    edges_out = edges
+
+#write to a temp file and swap it in so a running query never sees a half-written graph
+tmp_path = graph_path + ".tmp"
+with open(tmp_path, "w", encoding="utf-8") as f_out:
+    for a, b in edges_out:
+        weight = 1 if (b, a) not in edges else 2
+        f_out.write(f"{a},{b},{weight}\n")
+os.replace(tmp_path, graph_path)
+
+#keep the compressed base in step if the export produced one
+if os.path.exists(compressed_path):
+    adjacency = defaultdict(list)
+    for a, b in edges:
+        weight = 1 if (b, a) not in edges else 2
+        adjacency[int(a)].append((int(b), weight))
+    write_compressed_graph(compressed_path + ".tmp", adjacency)
+    os.replace(compressed_path + ".tmp", compressed_path)
+
+if new_titles:
+    with open(titles_path, "r", encoding="utf-8") as f:
+        known_ids = set(line.split("\t", 1)[0] for line in f)
+    with open(titles_path, "a", encoding="utf-8") as f_out:
+        for page_id, title in new_titles.items():
+            if page_id not in known_ids:
+                f_out.write(f"{page_id}\t{title}\n")
+
+#replaying the delta on the new base is harmless, so only the compacted prefix is dropped.
+#the rest is swapped in whole so a query never reads a half-written delta
+with open(delta_path, "r", encoding="utf-8") as f:
+    remaining = f.readlines()[len(delta_lines):]
+with open(delta_path + ".tmp", "w", encoding="utf-8") as f_out:
+    f_out.writelines(remaining)
+os.replace(delta_path + ".tmp", delta_path)
+
+print(f"Finished compacting graph.csv with {len(edges):,} edges.")
@@ -0,0 +1,56 @@
+import csv
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+
+#script to compare graph formats (graph.csv vs the compressed graph.wgc) and node orderings on size and latency.
+#runs the pathfinder on the same random article pairs for every graph and reads back its metrics rows.
+#usage: python scripts/benchmark_formats.py [queries] [dijkstra|dial] [graph_file[:order_file] ...]
+#e.g. export once per --order=..., copy graph.csv/graph_order.tsv aside, then list each pair here.
+
+pathfinder = os.path.abspath("cplusplus/pathfinder")
+titles_file = "data/top100k_id_title.tsv"
+default_order = "data/graph_order.tsv" if os.path.exists("data/graph_order.tsv") else None
+
+num_queries = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+algorithm = sys.argv[2] if len(sys.argv) > 2 else "dijkstra"
+if len(sys.argv) > 3:
+    graphs = [tuple(spec.split(":", 1)) if ":" in spec else (spec, None) for spec in sys.argv[3:]]
+else:
+    graphs = [("data/graph.csv", default_order), ("data/graph.wgc", default_order)]
+
+with open(titles_file, encoding="utf-8") as f:
+    page_ids = [line.split("\t", 1)[0] for line in f if "\t" in line]
+
+random.seed(0)
+pairs = [random.sample(page_ids, 2) for _ in range(num_queries)]
+
+print(f"{'graph':<16}{'MB':>9}{'bytes/edge':>12}{'load ms':>10}{'query ms':>10}{'p90 ms':>10}")
+for graph_file, order_file in graphs:
+    if not os.path.exists(graph_file):
+        print(f"{graph_file:<16}  (missing, skipped)")
+        continue
+
+    command = [pathfinder, os.path.abspath(graph_file), algorithm]
+    options = ["--order", os.path.abspath(order_file)] if order_file else []
+    #the pathfinder appends to ./performance_metrics.csv and writes ../results, so keep both out of the repo
+    with tempfile.TemporaryDirectory() as tmp:
+        run_dir = os.path.join(tmp, "run")
+        os.makedirs(run_dir)
+        for source, target in pairs:
+            subprocess.run(command + [source, target] + options,
+                           cwd=run_dir, capture_output=True, check=True)
+        with open(os.path.join(run_dir, "performance_metrics.csv"), newline="") as f:
+            rows = list(csv.reader(f))
+
+    load_times = [float(row[4]) for row in rows]
+    query_times = sorted(float(row[5]) for row in rows)
+    graph_edges = int(rows[0][9])
+    size = os.path.getsize(graph_file)
+    p90 = query_times[int(0.9 * (len(query_times) - 1))]
+
+    print(f"{os.path.basename(graph_file):<16}{size / 1e6:>9.1f}{size / graph_edges:>12.2f}"
+          f"{statistics.mean(load_times):>10.1f}{statistics.mean(query_times):>10.1f}{p90:>10.1f}")
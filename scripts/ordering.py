@@ -0,0 +1,56 @@
+from collections import deque
+
+#node orderings for the export stage, used to relabel nodes so linked pages sit close together in memory.
+#each takes {node: set(neighbors)} over the undirected link graph and returns every node exactly once;
+#a node's new label is its position in the returned list.
+
+
+def degree_order(neighbors):
+    """Hubs first: nodes by descending degree, ties broken by id."""
+    return sorted(neighbors, key=lambda node: (-len(neighbors[node]), node))
+
+
+def bfs_order(neighbors):
+    """Breadth-first order, starting each connected component from its highest-degree node."""
+    order = []
+    seen = set()
+    for start in degree_order(neighbors):
+        if start in seen:
+            continue
+        seen.add(start)
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
+            order.append(node)
+            for neighbor in sorted(neighbors[node]):
+                if neighbor not in seen:
+                    seen.add(neighbor)
+                    queue.append(neighbor)
+    return order
+
+
+def rcm_order(neighbors):
+    """Reverse Cuthill-McKee: BFS from low-degree nodes, visiting neighbors by ascending degree, then reversed."""
+    order = []
+    seen = set()
+    for start in sorted(neighbors, key=lambda node: (len(neighbors[node]), node)):
+        if start in seen:
+            continue
+        seen.add(start)
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
+            order.append(node)
+            for neighbor in sorted(neighbors[node], key=lambda n: (len(neighbors[n]), n)):
+                if neighbor not in seen:
+                    seen.add(neighbor)
+                    queue.append(neighbor)
+    order.reverse()
+    return order
+
+
+ORDERINGS = {
+    "bfs": bfs_order,
+    "rcm": rcm_order,
+    "degree": degree_order,
+}
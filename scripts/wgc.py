@@ -0,0 +1,51 @@
+import sys
+from array import array
+
+#writer for the compressed graph format (.wgc) that graph.cpp decodes on the fly, WebGraph-style:
+#  header: b"WGC1", uint32 node count, uint64 edge count (little-endian)
+#  uint32 node ids in ascending order, then uint64 byte offsets into the adjacency blob (node count + 1)
+#  adjacency blob: for each node its neighbors in ascending order, each one varint of (gap << 1) | (weight - 1).
+#  the first gap is the zigzagged difference from the node's own id, later gaps are (next - previous - 1).
+
+
+def _zigzag(value):
+    return value << 1 if value >= 0 else ((-value) << 1) - 1
+
+
+def _write_varint(value, out):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _little_endian(values):
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values.tobytes()
+
+
+def write_compressed_graph(path, adjacency):
+    """Writes {from_id: [(to_id, weight), ...]} with integer ids to path and returns the file size in bytes."""
+    nodes = sorted(adjacency)
+    offsets = array("Q", [0])
+    blob = bytearray()
+    edge_count = 0
+
+    for node in nodes:
+        previous = None
+        for neighbor, weight in sorted(adjacency[node]):
+            gap = _zigzag(neighbor - node) if previous is None else neighbor - previous - 1
+            _write_varint((gap << 1) | (weight - 1), blob)
+            previous = neighbor
+        edge_count += len(adjacency[node])
+        offsets.append(len(blob))
+
+    header = b"WGC1" + len(nodes).to_bytes(4, "little") + edge_count.to_bytes(8, "little")
+    with open(path, "wb") as f_out:
+        f_out.write(header)
+        f_out.write(_little_endian(array("I", nodes)))
+        f_out.write(_little_endian(offsets))
+        f_out.write(blob)
+
+    return len(header) + 4 * len(nodes) + 8 * len(offsets) + len(blob)
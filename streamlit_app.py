@@ -2,6 +2,7 @@ import streamlit as st
 import random
 import subprocess
 import os
+import time
 from collections import deque
 import pandas as pd
 import plotly.express as px
@@ -66,16 +67,17 @@ def download_graph_from_gdrive():
             st.error(f"❌ Fallback download failed: {str(fallback_error)}")
             return False
 
-@st.cache_data
-def load_title_id_map():
+@st.cache_data(max_entries=1)
+def load_title_id_map(titles_mtime):
     """
     Loads the mapping from page IDs to titles and vice versa from a TSV file.
     Note: This requires the 'data/top100k_id_title.tsv' file to be present.
+    The file's mtime is passed in so the cache refreshes when delta compaction appends new titles.
     """
     id_to_title = {}
     title_to_id = {}
     
-    data_file_path = "data/top100k_id_title.tsv"
+    data_file_path = TITLES_FILE_PATH
     if not os.path.exists(data_file_path):
         st.error(f"Error: The data file '{data_file_path}' was not found.")
         return {}, {}
@@ -93,12 +95,79 @@ def load_title_id_map():
         return {}, {}
     return id_to_title, title_to_id
 
+@st.cache_data(max_entries=1)
+def load_delta_titles(delta_mtime):
+    """
+    Loads titles of pages added through the link delta ('node,<id>,<title>' lines).
+    The delta file's mtime is passed in so the cache refreshes whenever the delta changes.
+    """
+    delta_titles = {}
+    if delta_mtime is None:
+        return delta_titles
+
+    with open(DELTA_FILE_PATH, encoding="utf-8") as f:
+        for line in f:
+            parts = line.rstrip("\n").split(",", 2)
+            if len(parts) == 3 and parts[0] == "node":
+                delta_titles[parts[1]] = parts[2]
+    return delta_titles
+
+def run_pathfinder(command, status):
+    """
+    Runs the pathfinder under a per-query deadline and returns its stdout.
+    The process is polled instead of waited on: each poll updates the status placeholder, which is where
+    Streamlit raises if the user has started a new run, and the finally block then terminates the search
+    (the pathfinder treats SIGTERM as a cancellation). Raises CalledProcessError if the pathfinder fails and
+    TimeoutExpired if it outlives its deadline by more than the grace period.
+    """
+    start = time.monotonic()
+    process = subprocess.Popen(
+        command + ["--deadline-ms", str(QUERY_DEADLINE_MS)],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+    )
+    try:
+        while True:
+            try:
+                stdout, stderr = process.communicate(timeout=0.25)
+                break
+            except subprocess.TimeoutExpired:
+                elapsed = time.monotonic() - start
+                if elapsed > QUERY_DEADLINE_MS / 1000 + QUERY_GRACE_SECONDS:
+                    raise subprocess.TimeoutExpired(command, elapsed)
+                status.caption(f"⏱️ Searching... {elapsed:.1f}s of {QUERY_DEADLINE_MS / 1000:g}s budget")
+    finally:
+        if process.poll() is None:
+            process.terminate()
+            try:
+                process.communicate(timeout=2)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.communicate()
+    status.empty()
+
+    if process.returncode != 0:
+        raise subprocess.CalledProcessError(process.returncode, command, stdout, stderr)
+    return stdout
+
+TITLES_FILE_PATH = "data/top100k_id_title.tsv"
+DELTA_FILE_PATH = "data/graph_delta.csv"
+COMPRESSED_GRAPH_PATH = "data/graph.wgc"
+ORDER_FILE_PATH = "data/graph_order.tsv"
+QUERY_DEADLINE_MS = 10_000
+QUERY_GRACE_SECONDS = 5
+
 # Download graph data if needed (this runs once when the app starts)
 if not download_graph_from_gdrive():
     st.error("❌ Cannot proceed without graph data. Please check your Google Drive file ID and permissions.")
     st.stop()
 
-id_to_title, title_to_id = load_title_id_map()
+titles_mtime = os.path.getmtime(TITLES_FILE_PATH) if os.path.exists(TITLES_FILE_PATH) else None
+id_to_title, title_to_id = load_title_id_map(titles_mtime)
+delta_mtime = os.path.getmtime(DELTA_FILE_PATH) if os.path.exists(DELTA_FILE_PATH) else None
+delta_titles = load_delta_titles(delta_mtime)
+if delta_titles:
+    id_to_title = {**id_to_title, **delta_titles}
+    title_to_id = {**title_to_id, **{title: page_id for page_id, title in delta_titles.items()}}
 titles = sorted(title_to_id.keys())
 
 st.sidebar.title("🔍 Wikipedia Pathfinder")
@@ -175,20 +244,32 @@ if page == "Home":
                 st.error("One or both of the articles were not found in the dataset. Please enter a valid article title.")
             else:
                 with st.spinner(f"🔍 Finding path from \"{src}\" to \"{dst}\" using {algorithm}..."):
+                    # the compressed graph (export with --compressed) is smaller in memory and faster to load
+                    graph_path = COMPRESSED_GRAPH_PATH if os.path.exists(COMPRESSED_GRAPH_PATH) else "data/graph.csv"
+                    command = ["./cplusplus/pathfinder", graph_path, algorithm.lower().replace("'", "").strip(), src_id, dst_id]
+                    if os.path.exists(DELTA_FILE_PATH):
+                        command += ["--delta", DELTA_FILE_PATH]
+                    # graphs exported with --order use dense labels; the pathfinder maps them back to page ids
+                    if os.path.exists(ORDER_FILE_PATH):
+                        command += ["--order", ORDER_FILE_PATH]
                     try:
-                        result = subprocess.run(
-                            ["./cplusplus/pathfinder", "data/graph.csv", algorithm.lower().replace("'", "").strip(), src_id, dst_id],
-                            capture_output=True, text=True, check=True
-                        )
-                        output = result.stdout.strip()
+                        output = run_pathfinder(command, st.empty()).strip()
                     except FileNotFoundError:
                         st.error("Pathfinder executable or data file not found. Please ensure all files are in their correct locations.")
                         output = ""
                     except subprocess.CalledProcessError as e:
                         st.error(f"An error occurred while running the pathfinder program: {e.stderr}")
                         output = ""
+                    except subprocess.TimeoutExpired:
+                        st.error(f"The pathfinder did not respond within its {QUERY_DEADLINE_MS / 1000:g}s budget and was stopped.")
+                        output = ""
 
-                if "No path found" in output:
+                if "exceeded budget" in output:
+                    budget_line = next(line for line in output.splitlines() if "exceeded budget" in line)
+                    st.warning(f"⏱️ Search stopped before finding a path. {budget_line}")
+                    with st.expander("Full Output"):
+                        st.text(output)
+                elif "No path found" in output:
                     st.error("No path found between the selected articles.")
                 elif output:
                     st.success("✅ Path found!")
@@ -416,6 +497,9 @@ elif page == "Performance Metrics":
             lambda x: id_to_title.get(str(x), f"ID {x} (Unknown)"))
         
         valid_metrics_df = metrics_df[metrics_df["Path Length"] >= 0]
+        over_budget = (metrics_df["Path Length"] == -2).sum()
+        if over_budget:
+            st.info(f"{over_budget} searches were stopped after exceeding their time budget (Path Length -2).")
         
         with st.expander("View Raw Metrics Data"):
             st.dataframe(metrics_df)